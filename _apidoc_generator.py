@@ -9,10 +9,31 @@ API versions to _apidoc.js, and updates the version in apidoc.json.
 import os
 import re
 import json
+import mmap
 from pathlib import Path
 import argparse
-from collections import defaultdict
+from operator import itemgetter
 import datetime
+import functools
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SOURCE_EXTENSIONS = ('.cpp', '.c', '.h', '.hpp')
+# Below this many bytes of source to parse, worker start-up costs more than it saves
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024
+# Sidecar file in the apidoc directory mapping source path -> [mtime_ns, size, comments]
+CACHE_FILENAME = '.apidoc_cache.json'
+# Bump whenever extraction output changes (patterns, tuple layout) so old caches are dropped
+CACHE_FORMAT_VERSION = 1
+
+# Precompiled patterns for apiDocJS tags and comment blocks (bytes, for mmap scanning)
+_RE_FIELDS = re.compile(rb'@apiName\s+(\S+)|@apiGroup\s+(\S+)|@apiVersion\s+([0-9.]+)')
+_RE_BLOCK = re.compile(rb'/\*\*[\s\S]*?\*/')
+_RE_APIDOC = re.compile(rb'/\*\*(?:(?!\*/)[\s\S])*?@api\s[\s\S]*?\*/')
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -22,44 +43,76 @@ def parse_arguments():
     parser.add_argument('--recursive', '-r', action='store_true', help='Search source files recursively')
     parser.add_argument('--output', default='_apidoc.js', help='Output file for version history')
     parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse all source files, ignoring the extraction cache')
     return parser.parse_args()
 
+@functools.lru_cache(maxsize=None)
+def _vkey(version):
+    """Parse a dotted version string into a sortable tuple."""
+    return tuple(map(int, version.split('.')))
+
+@functools.lru_cache(maxsize=None)
+def _vkey_packed(version):
+    """Pack a dotted version into one int ordered like _vkey, or None if it does not fit."""
+    parts = _vkey(version)
+    if len(parts) > 4 or max(parts) > 0xFFFF:
+        return None
+    key = 0
+    for part in parts:
+        key = (key << 16) | part
+    # Zero-pad to four components, then break ties on length so "1.0" < "1.0.0" as with tuples
+    return (key << (16 * (4 - len(parts))) << 3) | len(parts)
+
+def _version_sort_key(versions):
+    """Return the cheapest key function that orders all of versions correctly."""
+    if all(_vkey_packed(version) is not None for version in versions):
+        return _vkey_packed
+    return _vkey
+
+def _dump_json(data):
+    """Serialize data as 2-space indented JSON bytes, using orjson when available."""
+    if orjson is not None:
+        dumped = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        # orjson cannot escape non-ASCII; keep json's \uXXXX output in that case
+        if dumped.isascii():
+            return dumped
+    return json.dumps(data, indent=2).encode('ascii')
+
 def normalize_comment(comment):
     """Normalize comment text for consistent comparison."""
     return '\n'.join(line.strip() for line in comment.splitlines()).strip()
 
+def scan_comment_blocks(file_path, pattern):
+    """Yield (unique_key, version, comment) for each block matching pattern in a memory-mapped file."""
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Most source files carry no apiDoc tags; a plain find skips the regex for them
+            if mm.find(b'@api') < 0:
+                return
+            for match in pattern.finditer(mm):
+                block = match.group(0)
+                unique_key, version = extract_api_details(block)
+                yield unique_key, version, block.decode('utf-8', 'replace')
+
 def extract_api_comments(file_path):
-    """Extract apiDocJS comments from a file."""
-    api_comments = []
-    current_comment = []
-    in_comment = False
-    
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            if '/**' in line and not in_comment:
-                in_comment = True
-                current_comment = [line]
-            elif '*/' in line and in_comment:
-                current_comment.append(line)
-                comment_text = ''.join(current_comment)
-                if '@api ' in comment_text:
-                    api_comments.append(normalize_comment(comment_text))
-                current_comment = []
-                in_comment = False
-            elif in_comment:
-                current_comment.append(line)
-    
-    return api_comments
+    """Extract apiDocJS comments from a file as (unique_key, version, comment) tuples."""
+    return list(scan_comment_blocks(file_path, _RE_APIDOC))
 
 def extract_api_details(comment):
-    """Extract unique key and version from a comment block."""
-    name_match = re.search(r'@apiName\s+([^\s]+)', comment)
-    group_match = re.search(r'@apiGroup\s+([^\s]+)', comment)
-    version_match = re.search(r'@apiVersion\s+([0-9.]+)', comment)
+    """Extract unique key and version from a raw (bytes) comment block."""
+    # Single scan; the first occurrence of each tag wins
+    fields = [None, None, None]
+    for match in _RE_FIELDS.finditer(comment):
+        index = match.lastindex - 1
+        if fields[index] is None:
+            fields[index] = match.group(match.lastindex).decode('utf-8', 'replace')
     
-    name = name_match.group(1) if name_match else "Unnamed"
-    group = group_match.group(1) if group_match else "Ungrouped"
-    version = version_match.group(1) if version_match else None
+    name = fields[0] or "Unnamed"
+    group = fields[1] or "Ungrouped"
+    version = fields[2]
     
     # Create a unique key based on name and group (not including version)
     unique_key = f"{name}__{group}"
@@ -68,11 +121,11 @@ def extract_api_details(comment):
 
 def get_current_api_info(api_comments):
     """Build a dictionary of current API versions and comments."""
-    api_info = defaultdict(dict)
-    for comment in api_comments:
-        unique_key, version = extract_api_details(comment)
+    api_info = {}
+    for unique_key, version, comment in api_comments:
         if unique_key and version:
-            api_info[unique_key][version] = comment
+            comment = normalize_comment(comment)
+            api_info.setdefault(unique_key, {})[version] = comment
     return api_info
 
 def load_existing_api_info(apidoc_js_path):
@@ -80,32 +133,21 @@ def load_existing_api_info(apidoc_js_path):
     if not os.path.exists(apidoc_js_path):
         return {}
     
-    existing_api_info = defaultdict(dict)
-    with open(apidoc_js_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    comment_blocks = re.findall(r'/\*\*[\s\S]*?\*/', content)
-    for comment in comment_blocks:
-        normalized_comment = normalize_comment(comment)
-        unique_key, version = extract_api_details(normalized_comment)
+    existing_api_info = {}
+    for unique_key, version, comment in scan_comment_blocks(apidoc_js_path, _RE_BLOCK):
         if unique_key and version:
-            existing_api_info[unique_key][version] = normalized_comment
+            normalized_comment = normalize_comment(comment)
+            existing_api_info.setdefault(unique_key, {})[version] = normalized_comment
     return existing_api_info
 
 def generate_new_content(current_api_info, existing_api_info):
     """Generate new content for _apidoc.js based on current and existing API info."""
-    merged_api_info = defaultdict(dict)
+    # Start from a copy of the existing API info
+    merged_api_info = {unique_key: dict(versions) for unique_key, versions in existing_api_info.items()}
     
-    # First, add all existing API info to merged info
-    for unique_key, versions in existing_api_info.items():
-        for version, comment in versions.items():
-            merged_api_info[unique_key][version] = comment
-    
-    # Then, update or add current API info
+    # Then, update or add current API info; the same version is overwritten
     for unique_key, versions in current_api_info.items():
-        for version, comment in versions.items():
-            # If the same version exists, overwrite it
-            merged_api_info[unique_key][version] = comment
+        merged_api_info.setdefault(unique_key, {}).update(versions)
     
     # Count changes
     updates = 0
@@ -119,15 +161,18 @@ def generate_new_content(current_api_info, existing_api_info):
             else:
                 additions += 1
     
-    # Sort all entries by key and version
-    all_comments = []
-    for unique_key in sorted(merged_api_info.keys()):
-        for version in sorted(merged_api_info[unique_key].keys(), 
-                             key=lambda v: tuple(map(int, v.split('.'))), 
-                             reverse=True):  # Sort versions in descending order
-            all_comments.append(merged_api_info[unique_key][version])
+    # Sort all entries by key and version with two stable sorts over one flat list:
+    # versions descending first, then keys ascending
+    entries = [(unique_key, version, comment)
+               for unique_key, versions in merged_api_info.items()
+               for version, comment in versions.items()]
+    version_key = _version_sort_key({version for _, version, _ in entries})
+    entries.sort(key=lambda entry: version_key(entry[1]), reverse=True)
+    latest_version = entries[0][1] if entries else None
+    entries.sort(key=itemgetter(0))
+    all_comments = [comment for _, _, comment in entries]
     
-    return all_comments, updates, additions
+    return all_comments, updates, additions, latest_version
 
 def write_apidoc_js(apidoc_js_path, all_comments):
     """Write all comments to _apidoc.js."""
@@ -136,53 +181,123 @@ def write_apidoc_js(apidoc_js_path, all_comments):
     
     with open(apidoc_js_path, 'w', encoding='utf-8') as f:
         f.write(header)
-        for comment in all_comments:
-            f.write(comment + "\n\n")
+        f.writelines(comment + "\n\n" for comment in all_comments)
 
-def update_apidoc_json(apidoc_dir, all_comments):
-    """Update apidoc.json with the latest version from comments."""
+def update_apidoc_json(apidoc_dir, latest_version):
+    """Update apidoc.json with the latest API version."""
     apidoc_json_path = Path(apidoc_dir) / 'apidoc.json'
     if not apidoc_json_path.exists():
         return
     
-    latest_version = None
-    versions = []
-    
-    for comment in all_comments:
-        version_match = re.search(r'@apiVersion\s+([0-9.]+)', comment)
-        if version_match:
-            versions.append(version_match.group(1))
-    
-    if versions:
-        latest_version = max(versions, key=lambda v: tuple(map(int, v.split('.'))))
-    
     if latest_version:
         with open(apidoc_json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         if data.get('version') != latest_version:
             data['version'] = latest_version
-            with open(apidoc_json_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
-                f.write('\n')
+            with open(apidoc_json_path, 'wb') as f:
+                f.write(_dump_json(data) + b'\n')
             return True
     return False
 
 def find_source_files(src_dir, recursive=False):
-    """Find all C++ source files."""
-    extensions = ['.cpp', '.c', '.h', '.hpp']
+    """Yield os.DirEntry objects for all C++ source files."""
+    stack = [src_dir]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(SOURCE_EXTENSIONS) and entry.is_file():
+                    yield entry
+        # Push in reverse so subdirectories are visited in listing order, as os.walk does
+        stack.extend(reversed(subdirs))
+
+def _extract_files(source_files, total_size, verbose):
+    """Run extract_api_comments over files, in parallel for larger workloads; results keep input order."""
+    # Worker start-up only pays off with several cores and enough bytes to scan
+    if (os.cpu_count() or 1) <= 1 or total_size < PARALLEL_MIN_BYTES:
+        results = []
+        for file_path in source_files:
+            if verbose:
+                print(f"Processing {file_path}")
+            results.append(extract_api_comments(file_path))
+        return results
+    
+    if verbose:
+        for file_path in source_files:
+            print(f"Processing {file_path}")
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(extract_api_comments, source_files, chunksize=16))
+
+def load_extraction_cache(cache_path):
+    """Load the per-file extraction cache, or an empty one if missing, unreadable or outdated."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get('version') != CACHE_FORMAT_VERSION:
+        return {}
+    files = data.get('files')
+    return files if isinstance(files, dict) else {}
+
+def save_extraction_cache(cache_path, cache):
+    """Atomically write the per-file extraction cache."""
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'version': CACHE_FORMAT_VERSION, 'files': cache}, f)
+    os.replace(tmp_path, cache_path)
+
+def _is_fresh_cache_entry(entry, stamp):
+    """Check that a cache entry is well-formed and matches the file's [mtime_ns, size] stamp."""
+    if not isinstance(entry, list) or len(entry) != 3 or entry[:2] != stamp:
+        return False
+    comments = entry[2]
+    return isinstance(comments, list) and all(
+        isinstance(item, list) and len(item) == 3
+        and isinstance(item[0], str)
+        and (item[1] is None or isinstance(item[1], str))
+        and isinstance(item[2], str)
+        for item in comments)
+
+def collect_api_comments(source_entries, verbose=False, cache=None):
+    """Extract apiDocJS comments from the source files behind source_entries.
+    
+    Files whose mtime and size match their entry in cache reuse the cached
+    comments; malformed entries are treated as stale. cache is updated in
+    place to cover exactly these files. Returns the comments and whether
+    cache changed.
+    """
+    if cache is None:
+        cache = {}
+    
     source_files = []
+    stamps = {}
+    stale_files = []
+    for entry in source_entries:
+        file_path = entry.path
+        st = entry.stat()
+        source_files.append(file_path)
+        stamps[file_path] = [st.st_mtime_ns, st.st_size]
+        if _is_fresh_cache_entry(cache.get(file_path), stamps[file_path]):
+            if verbose:
+                print(f"Processing {file_path} (cached)")
+        else:
+            stale_files.append(file_path)
     
-    if recursive:
-        for root, _, files in os.walk(src_dir):
-            for file in files:
-                if any(file.endswith(ext) for ext in extensions):
-                    source_files.append(os.path.join(root, file))
-    else:
-        for file in os.listdir(src_dir):
-            if any(file.endswith(ext) for ext in extensions) and os.path.isfile(os.path.join(src_dir, file)):
-                source_files.append(os.path.join(src_dir, file))
+    stale_size = sum(stamps[file_path][1] for file_path in stale_files)
+    for file_path, comments in zip(stale_files, _extract_files(stale_files, stale_size, verbose)):
+        cache[file_path] = stamps[file_path] + [comments]
+    removed_files = set(cache) - set(stamps)
+    for file_path in removed_files:
+        del cache[file_path]
     
-    return source_files
+    all_api_comments = []
+    for file_path in source_files:
+        all_api_comments.extend(cache[file_path][2])
+    return all_api_comments, bool(stale_files or removed_files)
 
 def main():
     """Main execution function."""
@@ -198,12 +313,16 @@ def main():
     apidoc_dir.mkdir(parents=True, exist_ok=True)
     
     # Extract comments from source files
-    source_files = find_source_files(src_dir, args.recursive)
-    all_api_comments = []
-    for file_path in source_files:
-        if args.verbose:
-            print(f"Processing {file_path}")
-        all_api_comments.extend(extract_api_comments(file_path))
+    source_entries = find_source_files(src_dir, args.recursive)
+    if args.no_cache:
+        all_api_comments, _ = collect_api_comments(source_entries, args.verbose)
+    else:
+        cache_path = apidoc_dir / CACHE_FILENAME
+        cache = load_extraction_cache(cache_path)
+        all_api_comments, cache_changed = collect_api_comments(source_entries, args.verbose, cache)
+        # Only rewrite the cache when something was re-parsed or pruned
+        if cache_changed:
+            save_extraction_cache(cache_path, cache)
     
     if not all_api_comments:
         print("No API comments found.")
@@ -214,13 +333,13 @@ def main():
     existing_api_info = load_existing_api_info(apidoc_js_path)
     
     # Generate new content
-    all_comments, updates, additions = generate_new_content(current_api_info, existing_api_info)
+    all_comments, updates, additions, latest_version = generate_new_content(current_api_info, existing_api_info)
     
     # Write to _apidoc.js
     write_apidoc_js(apidoc_js_path, all_comments)
     
     # Update apidoc.json
-    json_updated = update_apidoc_json(apidoc_dir, all_comments)
+    json_updated = update_apidoc_json(apidoc_dir, latest_version)
     
     # Print summary
     print(f"Updated {apidoc_js_path}:")